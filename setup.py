@@ -14,6 +14,7 @@ setup(
     version="dev",
     description="Simple Pythonic Dependency Injection Helper",
     packages=find_packages(),
+    python_requires=">=3.6",
     author="Martin Atkins",
     author_email="mart@degeneration.co.uk",
 
@@ -26,7 +27,6 @@ setup(
     tests_require=[
         'nose>=1.0',
         'coverage',
-        'mock',
         'pep8',
     ],
     install_requires=[
@@ -34,5 +34,6 @@ setup(
     classifiers=[
         "License :: OSI Approved :: MIT License",
         "Intended Audience :: Developers",
+        "Programming Language :: Python :: 3",
     ]
 )
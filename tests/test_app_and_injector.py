@@ -1,7 +1,16 @@
 
+import gc
+import sys
 import unittest
-from mock import MagicMock
-from tiedye import Application, Injector
+import weakref
+from unittest.mock import MagicMock
+from tiedye import (
+    Application,
+    Injector,
+    DependencyError,
+    DependencyCycleError,
+    ProviderSet,
+)
 
 
 class TestAppAndInjector(unittest.TestCase):
@@ -104,22 +113,21 @@ class TestAppAndInjector(unittest.TestCase):
         )
         # Our given providers are registered.
         self.assertEqual(
-            injector.providers[interface1].im_func,
+            injector.providers[interface1].__func__,
             provider1,
         )
         self.assertEqual(
-            injector.providers[interface2].im_func,
+            injector.providers[interface2].__func__,
             provider1,
         )
-        # Injector registers a provider for itself.
-        self.assertEqual(
-            injector.providers[Injector](Injector),
-            injector,
-        )
         # No other providers are registered.
         self.assertEqual(
             len(injector.providers),
-            3,
+            2,
+        )
+        # ...but the injector can always provide itself.
+        self.assertTrue(
+            injector.get(Injector) is injector,
         )
 
         self.assertEqual(
@@ -131,7 +139,7 @@ class TestAppAndInjector(unittest.TestCase):
             app,
         )
         self.assertEqual(
-            specialized_injector.providers[interface1].im_func,
+            specialized_injector.providers[interface1].__func__,
             provider1,
         )
         self.assertEqual(
@@ -142,13 +150,12 @@ class TestAppAndInjector(unittest.TestCase):
             specialized_injector.providers[interface3],
             provider2,
         )
-        self.assertEqual(
-            specialized_injector.providers[Injector](Injector),
-            specialized_injector,
-        )
         self.assertEqual(
             len(specialized_injector.providers),
-            4,
+            3,
+        )
+        self.assertTrue(
+            specialized_injector.get(Injector) is specialized_injector,
         )
 
     def test_injector_full_bind(self):
@@ -240,6 +247,16 @@ class TestAppAndInjector(unittest.TestCase):
             bound_func(),
             ("hi", "cheese"),
         )
+        # Re-binding a partially-bound function doesn't wrap it in a
+        # further layer, so calling the result stays cheap no matter how
+        # many times it's been re-bound.
+        self.assertTrue(
+            bound_func.func is func,
+        )
+        self.assertEqual(
+            bound_func.keywords,
+            {"a": "hi", "b": "cheese"},
+        )
 
     def test_injector_method_bind(self):
         app = Application()
@@ -311,3 +328,436 @@ class TestAppAndInjector(unittest.TestCase):
         self.assertTrue(
             injector.get(interface1) is injector.get(interface1),
         )
+
+    def test_injector_provider_chain(self):
+        app = Application()
+        interfaces = [MagicMock(name="interface%i" % i) for i in range(50)]
+
+        def make_provider(i):
+            if i == 0:
+                return lambda iface: 0
+
+            @app.dependencies(prev=interfaces[i - 1])
+            def provider(iface, prev):
+                return prev + 1
+            return provider
+
+        injector = app.make_injector(
+            local_providers=dict(
+                (interface, make_provider(i))
+                for i, interface in enumerate(interfaces)
+            ),
+        )
+
+        @app.dependencies(a=interfaces[-1])
+        def func(a):
+            return a
+
+        self.assertEqual(
+            injector.call(func),
+            49,
+        )
+        self.assertEqual(
+            injector.get(interfaces[25]),
+            25,
+        )
+
+    def test_injector_dependency_cycle(self):
+        app = Application()
+        interface1 = MagicMock(name="interface1")
+        interface2 = MagicMock(name="interface2")
+
+        @app.dependencies(b=interface2)
+        def interface1_provider(iface, b):
+            pass
+
+        @app.dependencies(a=interface1)
+        def interface2_provider(iface, a):
+            pass
+
+        injector = app.make_injector(
+            local_providers={
+                interface1: interface1_provider,
+                interface2: interface2_provider,
+            }
+        )
+
+        @app.dependencies(a=interface1)
+        def func(a):
+            pass
+
+        with self.assertRaises(DependencyCycleError):
+            injector.bind(func)
+
+        # The failed bind must not leave anything behind that would
+        # interfere with later binds.
+        def func2():
+            return "ok"
+
+        self.assertEqual(
+            injector.call(func2),
+            "ok",
+        )
+        with self.assertRaises(DependencyCycleError):
+            injector.bind(func)
+
+    def test_injector_specialize_singletons(self):
+        app = Application()
+        interface1 = MagicMock(name="interface1")
+        interface2 = MagicMock(name="interface2")
+        interface3 = MagicMock(name="interface3")
+
+        def singleton_provider(iface):
+            return {}
+
+        singleton_provider.singleton = True
+
+        injector = app.make_injector(
+            local_providers={
+                interface1: singleton_provider,
+                interface2: singleton_provider,
+                interface3: lambda iface: {},
+            }
+        )
+        provided1 = injector.get(interface1)
+        provided2 = injector.get(interface2)
+        provided3 = injector.get(interface3)
+
+        specialized_injector = injector.specialize(
+            local_providers={
+                interface2: lambda iface: [],
+            }
+        )
+
+        # interface1 has a singleton provider, so the specialized
+        # injector shares the parent's implementation.
+        self.assertTrue(
+            specialized_injector.get(interface1) is provided1,
+        )
+        # interface2 has a new provider, so the parent's implementation
+        # is not used.
+        self.assertEqual(
+            specialized_injector.get(interface2),
+            [],
+        )
+        self.assertTrue(
+            injector.get(interface2) is provided2,
+        )
+        # interface3's provider isn't a singleton, so the specialized
+        # injector gets its own implementation.
+        provided3_specialized = specialized_injector.get(interface3)
+        self.assertEqual(provided3_specialized, {})
+        self.assertTrue(provided3_specialized is not provided3)
+        self.assertTrue(
+            specialized_injector.get(interface3) is provided3_specialized,
+        )
+
+        # A singleton is built by the injector it was given to even if a
+        # specialized injector asks for it first, so every specialized
+        # injector shares it.
+        injector = app.make_injector(
+            local_providers={
+                interface1: singleton_provider,
+            }
+        )
+        provided1 = injector.specialize().get(interface1)
+        self.assertTrue(injector.get(interface1) is provided1)
+        self.assertTrue(injector.specialize().get(interface1) is provided1)
+
+    def test_injector_specialize_overridden_dependency(self):
+        app = Application()
+        interface1 = MagicMock(name="interface1")
+        interface2 = MagicMock(name="interface2")
+        interface3 = MagicMock(name="interface3")
+        interface4 = MagicMock(name="interface4")
+
+        @app.dependencies(b=interface2)
+        def provide1(iface, b):
+            return "1(%s)" % b
+
+        @app.dependencies(a=interface1)
+        def provide3(iface, a):
+            return "3(%s)" % a
+
+        provide1.singleton = True
+        provide3.singleton = True
+
+        @app.dependencies(injector=Injector)
+        def provide4(iface, injector):
+            return injector
+
+        injector = app.make_injector(
+            local_providers={
+                interface1: provide1,
+                interface2: lambda iface: "parent",
+                interface3: provide3,
+                interface4: provide4,
+            }
+        )
+        self.assertEqual(injector.get(interface3), "3(1(parent))")
+        self.assertTrue(injector.get(interface4) is injector)
+
+        specialized_injector = injector.specialize(
+            local_providers={
+                interface2: lambda iface: "child",
+            }
+        )
+        further_specialized_injector = specialized_injector.specialize()
+
+        # interface3 was built from interface2 by way of interface1, so
+        # the parent's implementation can't be shared, even further down.
+        self.assertEqual(
+            further_specialized_injector.get(interface3),
+            "3(1(child))",
+        )
+        self.assertEqual(
+            specialized_injector.get(interface1),
+            "1(child)",
+        )
+        self.assertEqual(injector.get(interface3), "3(1(parent))")
+        # interface4's provider isn't a singleton, so it's given the
+        # specialized injector rather than the parent.
+        self.assertTrue(
+            specialized_injector.get(interface4) is specialized_injector,
+        )
+
+    def test_injector_bind_nothing_provided(self):
+        app = Application()
+        interface1 = MagicMock(name="interface1")
+
+        def no_deps(a):
+            return a
+
+        @app.dependencies(a=interface1)
+        def unprovided_deps(a):
+            return a
+
+        injector = app.make_injector()
+
+        # With nothing to inject there's no need for a wrapper.
+        self.assertTrue(
+            injector.bind(no_deps) is no_deps,
+        )
+        self.assertTrue(
+            injector.bind(unprovided_deps) is unprovided_deps,
+        )
+
+        self.assertEqual(
+            injector.call(no_deps, "hi"),
+            "hi",
+        )
+        with self.assertRaises(DependencyError):
+            injector.call(unprovided_deps)
+
+    def test_injector_provider_set(self):
+        interface1 = MagicMock(name="interface1")
+        interface2 = MagicMock(name="interface2")
+
+        class TestProviders(ProviderSet):
+
+            def __init__(self, greeting):
+                self.greeting = greeting
+
+            @ProviderSet.provide(interface1)
+            def get_impl1(self, iface):
+                return self.greeting
+
+            @ProviderSet.provide(interface2, i1=interface1)
+            def get_impl2(self, iface, i1):
+                return "%s world" % i1
+
+        # Provider sets aren't tied to a particular app, and the same
+        # type of provider set can be used by many injectors.
+        for greeting in ("hello", "howdy"):
+            app = Application()
+            for i in range(2):
+                injector = app.make_injector(TestProviders(greeting))
+                self.assertEqual(
+                    injector.get(interface2),
+                    "%s world" % greeting,
+                )
+
+    def test_injector_rebind(self):
+        app = Application()
+        interface1 = MagicMock(name="interface1")
+        interface2 = MagicMock(name="interface2")
+
+        @app.dependencies(a=interface1, b=interface2)
+        def func(a, b):
+            return (a, b)
+
+        injector = app.make_injector(
+            local_providers={
+                interface1: lambda iface: "hi",
+            },
+        )
+
+        self.assertEqual(
+            injector.bind(func)(b="world"),
+            ("hi", "world"),
+        )
+        # We didn't retain the bound function, but the injector still
+        # remembers what it resolved for func.
+        self.assertEqual(
+            injector.resolved_deps[func][:2],
+            ({"a": "hi"}, {"b": interface2}),
+        )
+        self.assertEqual(
+            injector.bind(func)(b="world"),
+            ("hi", "world"),
+        )
+
+    def test_injector_freed_without_gc(self):
+        app = Application()
+
+        @app.dependencies(injector=Injector)
+        def func(injector):
+            return injector
+
+        injector = app.make_injector()
+        specialized_injector = injector.specialize()
+        self.assertTrue(
+            specialized_injector.call(func) is specialized_injector,
+        )
+
+        # Nothing the injector keeps refers back to it, so it's freed as
+        # soon as we let go of it, without waiting for the cycle collector.
+        ref = weakref.ref(specialized_injector)
+        gc.disable()
+        try:
+            del specialized_injector
+            self.assertTrue(ref() is None)
+        finally:
+            gc.enable()
+
+    def test_injector_specialize_chain(self):
+        app = Application()
+        interface1 = MagicMock(name="interface1")
+        interface2 = MagicMock(name="interface2")
+
+        def singleton_provider(iface):
+            return {}
+
+        singleton_provider.singleton = True
+
+        injector = app.make_injector(
+            local_providers={
+                interface1: singleton_provider,
+                interface2: singleton_provider,
+            }
+        )
+        provided1 = injector.get(interface1)
+        injector.get(interface2)
+
+        middle_injector = injector.specialize(
+            local_providers={
+                interface2: lambda iface: [],
+            }
+        )
+        leaf_injector = middle_injector.specialize().specialize()
+
+        self.assertTrue(
+            leaf_injector.get(interface1) is provided1,
+        )
+        self.assertTrue(
+            leaf_injector.get(interface2) is not injector.get(interface2),
+        )
+        self.assertEqual(
+            leaf_injector.get(interface2),
+            [],
+        )
+
+        # Specializing without adding any providers doesn't add another
+        # layer for lookups to check.
+        self.assertTrue(
+            leaf_injector.providers is middle_injector.providers,
+        )
+
+        # Specializing deeper than the recursion limit still works.
+        for i in range(sys.getrecursionlimit() + 100):
+            leaf_injector = leaf_injector.specialize(
+                local_providers={
+                    interface1: singleton_provider,
+                },
+            )
+        self.assertTrue(interface2 in leaf_injector.providers)
+        self.assertEqual(len(leaf_injector.providers), 2)
+        self.assertEqual(
+            leaf_injector.get(interface2),
+            [],
+        )
+
+    def test_injector_unshared_provider(self):
+        app = Application()
+        interface1 = MagicMock(name="interface1")
+        calls = []
+
+        def interface1_provider(iface):
+            calls.append(iface)
+            return len(calls)
+
+        interface1_provider.shared = False
+
+        @app.dependencies(a=interface1)
+        def func(a):
+            return a
+
+        injector = app.make_injector(
+            local_providers={
+                interface1: interface1_provider,
+            },
+        )
+
+        self.assertEqual(
+            [
+                injector.call(func),
+                injector.call(func),
+                injector.get(interface1),
+            ],
+            [1, 2, 3],
+        )
+
+        # Marking an unshared provider as a singleton doesn't make its
+        # implementations shared with specialized injectors either.
+        interface1_provider.singleton = True
+        specialized_injector = injector.specialize()
+        self.assertEqual(
+            [
+                specialized_injector.call(func),
+                specialized_injector.get(interface1),
+            ],
+            [4, 5],
+        )
+
+    def test_injector_provider_per_injector(self):
+        app = Application()
+        interface1 = MagicMock(name="interface1")
+        calls = []
+
+        def interface1_provider(iface):
+            calls.append(iface)
+            return len(calls)
+
+        @app.dependencies(a=interface1)
+        def func(a):
+            return a
+
+        injector = app.make_injector(
+            local_providers={
+                interface1: interface1_provider,
+            },
+        )
+        self.assertEqual(injector.call(func), 1)
+
+        # An ordinary provider is called once by each injector, including
+        # each one specialized from the injector it was given to.
+        specialized_injector = injector.specialize()
+        self.assertEqual(
+            [
+                specialized_injector.call(func),
+                specialized_injector.get(interface1),
+                injector.specialize().get(interface1),
+                injector.get(interface1),
+            ],
+            [2, 2, 3, 1],
+        )
@@ -19,3 +19,11 @@ class TestInterface(unittest.TestCase):
         self.assertTrue(
             type(interface1) is not type(interface2),
         )
+
+    def test_interface_unnamed(self):
+        interface1 = make_interface()
+        interface2 = make_interface()
+
+        self.assertTrue(
+            type(interface1) is not type(interface2),
+        )
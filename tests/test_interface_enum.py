@@ -35,3 +35,29 @@ class TestInterfaceEnum(unittest.TestCase):
         self.assertTrue(
             enum1 is not enum2,
         )
+        self.assertEqual(
+            repr(enum1.foo),
+            "<interface_enum(foo, bar, baz).foo>",
+        )
+
+    def test_interface_enum_name(self):
+        # "name" and "_repr" are used internally by the enumeration
+        # instances, but they're still allowed as interface names.
+        enum = make_interface_enum(
+            "name",
+            "_repr",
+            "foo",
+        )
+
+        self.assertEqual(
+            [type(x) for x in (enum.name, enum._repr, enum.foo)],
+            [enum, enum, enum],
+        )
+        self.assertEqual(
+            [repr(x) for x in (enum.name, enum._repr, enum.foo)],
+            [
+                "<interface_enum(name, _repr, foo).name>",
+                "<interface_enum(name, _repr, foo)._repr>",
+                "<interface_enum(name, _repr, foo).foo>",
+            ],
+        )
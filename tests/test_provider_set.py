@@ -1,6 +1,6 @@
 
 import unittest
-import mock
+from unittest import mock
 
 from tiedye import ProviderSet
 
@@ -37,33 +37,33 @@ class TestProviderSet(unittest.TestCase):
         self.assertEqual(
             TestProvidersBase.providers,
             set([
-                TestProviders.get_impl1.im_func,
+                TestProviders.get_impl1,
             ])
         )
 
         self.assertEqual(
             TestProviders.providers,
             set([
-                TestProviders.get_impl1.im_func,
-                TestProviders.get_impl2.im_func,
+                TestProviders.get_impl1,
+                TestProviders.get_impl2,
             ])
         )
 
         self.assertEqual(
-            TestProviders.get_impl1.im_func.provider_interfaces,
-            set([interface1]),
+            TestProviders.get_impl1.provider_interfaces,
+            (interface1,),
         )
         self.assertEqual(
-            TestProviders.get_impl1.im_func.provider_dependencies,
+            TestProviders.get_impl1.provider_dependencies,
             {
                 "i2": interface2,
             },
         )
         self.assertEqual(
-            TestProviders.get_impl2.im_func.provider_interfaces,
-            set([interface1, interface2]),
+            TestProviders.get_impl2.provider_interfaces,
+            (interface1, interface2),
         )
         self.assertEqual(
-            TestProviders.get_impl2.im_func.provider_dependencies,
+            TestProviders.get_impl2.provider_dependencies,
             {},
         )
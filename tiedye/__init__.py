@@ -1,20 +1,29 @@
 
+import collections.abc
 import weakref
 import functools
 import types
 
 
-EMPTY_DEPS = {}
+EMPTY_PLAN = ()
+_MISSING = object()
 
 
 class Application(object):
 
     def __init__(self):
         self.dependency_map = weakref.WeakKeyDictionary()
+        # The same dependencies as in dependency_map, but pre-flattened
+        # into the form that Injector.bind iterates over so that this
+        # work is done once per callable rather than once per binding.
+        self._dependency_plans = weakref.WeakKeyDictionary()
+        # Types of the provider sets whose providers have already had
+        # their dependencies registered on this app.
+        self._registered_provider_set_types = weakref.WeakSet()
 
     def dependencies(self, *args, **mapping):
         def register(callable):
-            self.dependency_map[callable] = mapping
+            self._register(callable, mapping)
             return callable
         if len(args) == 1:
             register(args[0])
@@ -29,6 +38,16 @@ class Application(object):
                 )
             )
 
+    def _register(self, callable, mapping, plan=None):
+        # The guts of dependencies, for internal callers that already
+        # have a mapping dict and don't need the argument handling.
+        # Callers that have already compiled a plan for the mapping
+        # may pass it in to avoid compiling it again.
+        if plan is None:
+            plan = _compile_plan(mapping)
+        self.dependency_map[callable] = mapping
+        self._dependency_plans[callable] = plan
+
     def make_injector(self, *provider_sets, **kwargs):
         """
         Create an :py:class:`Injector` instance for the current app.
@@ -52,6 +71,15 @@ class Application(object):
         function has registered dependencies then these will be bound before
         the provider function is called.
 
+        Each provider function is called at most once per interface for the
+        lifetime of an injector, and the implementation it returns is
+        re-used for every callable that depends on that interface. A
+        provider function that must be called anew each time can opt out
+        of this by having an attribute ``shared`` set to ``False``. Whether
+        an implementation is also shared with injectors derived from this
+        one is controlled separately, as described on
+        :py:meth:`Injector.specialize`.
+
         """
         return Injector(
             self,
@@ -67,9 +95,23 @@ class Injector(object):
     Instead of instantiating ``Injector`` directly, prefer to use
     :py:meth:`Application.make_injector`.
     """
-
-    def __init__(self, app, provider_sets, local_providers=None):
+    # An injector is often created for each request, so we avoid the
+    # overhead of a per-instance dict.
+    __slots__ = (
+        "app",
+        "parent",
+        "providers",
+        "_own_providers",
+        "bound_funcs",
+        "resolved_deps",
+        "provided",
+        "_dependency_closures",
+        "__weakref__",
+    )
+
+    def __init__(self, app, provider_sets, local_providers=None, parent=None):
         self.app = app
+        self.parent = parent
         providers = {}
 
         # Build up a providers map from the provider sets, implicitly
@@ -77,43 +119,66 @@ class Injector(object):
         # Doing this late allows us to avoid tethering a provider set to
         # any particular app, thus allowing many apps to share a provider set
         # in an external shared library.
+        # Since a provider set's providers are fixed when its class is
+        # created, we only need to do the registration the first time we
+        # see a particular type of provider set.
+        register = self.app._register
+        registered_types = self.app._registered_provider_set_types
+        method_type = types.MethodType
         for provider_set in provider_sets:
-            for provider_impl in provider_set.providers:
-                # Register the dependencies on our app.
-                self.app.dependencies(
-                    provider_impl,
-                    **provider_impl.provider_dependencies
-                )
+            set_providers = provider_set.providers
+            set_type = type(provider_set)
+            if set_type not in registered_types:
+                for provider_impl in set_providers:
+                    register(
+                        provider_impl,
+                        provider_impl.provider_dependencies,
+                    )
+                registered_types.add(set_type)
+
+            for provider_impl in set_providers:
                 # provider_impl is a raw function that isn't yet bound
                 # to an instance, so we need to bind it to get the
-                # actual provider.
-                inst_provider_impl = types.MethodType(
-                    provider_impl,
-                    provider_set,
-                )
+                # actual provider. (A bound method is both cheaper to
+                # create and cheaper to call than an equivalent
+                # functools.partial.)
+                inst_provider_impl = method_type(provider_impl, provider_set)
                 for interface in provider_impl.provider_interfaces:
-                    providers[interface] = (
-                        inst_provider_impl
-                    )
+                    providers[interface] = inst_provider_impl
 
         if local_providers is not None:
             providers.update(local_providers)
 
-        # Expose the injector itself as an injectable object
-        providers[Injector] = lambda dummy: self
-
-        self.providers = providers
-        self.currently_binding = set()
+        self._own_providers = providers
+        if parent is None:
+            self.providers = providers
+        elif len(providers) == 0:
+            # Nothing to add, so there's no need for another layer that
+            # every lookup would have to check.
+            self.providers = parent.providers
+        else:
+            self.providers = _LayeredProviders(providers, parent.providers)
         # This is a weak key dictionary because we potentially create
         # many transient functions, such as when doing partial binding
         # or if the caller creates lambda functions in a loop. We'll
         # only retain the binding wrappers that are stored by a caller.
         self.bound_funcs = weakref.WeakValueDictionary()
+        # The (kwargs, unprovided, unprovided_plan) for each callable we've
+        # bound before, so that re-binding a callable whose earlier wrapper
+        # has since been discarded doesn't require visiting its dependencies
+        # or compiling a plan for its unprovided dependencies again. Our
+        # providers never change, so these never go stale.
+        self.resolved_deps = weakref.WeakKeyDictionary()
         # This one is not a weak dictionary because the maximum size of
         # this dictionary is bounded at the size of the providers
         # dictionary, and so it can't grow unbounded for the lifetime
         # of the injector.
         self.provided = {}
+        # The interfaces that each of our singleton providers depends on,
+        # directly or indirectly, so specialized injectors can tell whether
+        # it's safe to share what it provides. Bounded in the same way as
+        # provided.
+        self._dependency_closures = {}
 
     def get(self, interface):
         """
@@ -122,24 +187,27 @@ class Injector(object):
         If no provider is registered for the given interface, will raise
         a :py:class:`DependencyError`.
         """
-        try:
-            return self.provided[interface]
-        except KeyError:
-            pass
-
-        interface_type = type(interface)
-        if interface in self.providers:
-            provider = self.providers[interface]
-        elif interface_type in self.providers:
-            provider = self.providers[interface_type]
-        else:
+        provided = self.provided.get(interface, _MISSING)
+        if provided is not _MISSING:
+            return provided
+
+        provider = self._find_provider(interface)
+        if provider is _MISSING:
+            if interface is Injector:
+                return self
             raise DependencyError(
                 "No provider for %r" % interface
             )
 
+        if self.parent is not None:
+            provided = self._inherit_provided(interface, provider)
+            if provided is not _MISSING:
+                return provided
+
         # Bind the provider so it can request dependencies of its own.
         provided = self.call(provider, interface)
-        self.provided[interface] = provided
+        if getattr(provider, "shared", True):
+            self.provided[interface] = provided
         return provided
 
     def bind(self, func):
@@ -157,62 +225,245 @@ class Injector(object):
         be left unbound, and can thus be provided explicitly in a call
         to the returned callable or bound separately by a later call to
         :py:meth:`Injector.bind`; this is known as *partial binding*.
+
+        If none of the callable's dependencies can be provided then the
+        callable itself may be returned, rather than a wrapper.
         """
 
         # This is deliberately using 'func' rather than the 'lookup_func'
         # from below because when we're binding to an instance method we need
         # to create a distinct binding for each instance, not just one binding
         # for the method's function.
-        if func in self.bound_funcs:
-            return self.bound_funcs[func]
+        #
+        # A single get is important here since this is the common case
+        # once an application has warmed up, and each lookup in a weak
+        # dictionary is more expensive than in a plain one.
+        bound_funcs = self.bound_funcs
+        injected = bound_funcs.get(func)
+        if injected is not None:
+            return injected
 
+        if isinstance(func, types.MethodType):
+            lookup_func = func.__func__
+        else:
+            lookup_func = func
+
+        # Plenty of callables have no dependencies at all, in which case
+        # there's nothing to do.
+        if not self.app._dependency_plans.get(lookup_func):
+            return func
+
+        # Even if the caller didn't hang on to the wrapper from last time,
+        # we may already know what to inject.
+        resolved = self.resolved_deps.get(lookup_func)
+        if resolved is not None:
+            return self._finish_binding(func, lookup_func, *resolved)
+
+        providers = self.providers
+        provided = self.provided
+        parent = self.parent
+        if parent is not None:
+            inherit_provided = self._inherit_provided
+        dependency_map = self.app.dependency_map
+        dependency_plans = self.app._dependency_plans
+        method_type = types.MethodType
+        start_binding = self._start_binding
+        finish_binding = self._finish_binding
+        provide = self._provide
+
+        # Rather than recursing for each provider that has dependencies of
+        # its own, we walk the dependency graph with an explicit stack of
+        # binding frames. Each frame remembers which argument of the frame
+        # below it is waiting for the provider being bound, so that once
+        # the provider is bound we can call it and carry on where we
+        # left off.
+        #
+        # visiting holds the callables we're part-way through binding, in
+        # the same order as the stack, for cycle detection. Keeping this
+        # local rather than on the injector means that concurrent calls to
+        # bind from different threads can't interfere with one another.
+        visiting = {}
+        stack = [start_binding(func, None, None, visiting)]
+        # Becomes False if anything we inject came from a provider that
+        # isn't shared, in which case next time we must call it again, or
+        # if what we inject includes the injector itself.
+        reusable = True
+        while True:
+            frame = stack[-1]
+            kwargs = frame.kwargs
+            unprovided = frame.unprovided
+
+            for arg_name, interface, interface_type in frame.deps_iter:
+                value = provided.get(interface, _MISSING)
+                if value is not _MISSING:
+                    kwargs[arg_name] = value
+                    continue
+
+                provider = providers.get(interface, _MISSING)
+                if provider is _MISSING:
+                    provider = providers.get(interface_type, _MISSING)
+                if provider is _MISSING:
+                    if interface is Injector:
+                        # The injector itself is always injectable. We
+                        # handle this here rather than registering a
+                        # provider, which would need a closure referring
+                        # back to the injector and thus a reference cycle.
+                        kwargs[arg_name] = self
+                        if len(stack) == 1:
+                            # For the same reason we can't remember
+                            # these kwargs in resolved_deps.
+                            reusable = False
+                        continue
+                    # Record unprovided interfaces to allow partial
+                    # injection, e.g. to allow some interfaces to be
+                    # injected at application startup time and then
+                    # others to be injected on a per-request basis.
+                    unprovided[arg_name] = interface
+                    continue
+
+                if parent is not None and getattr(
+                    provider, "singleton", False,
+                ):
+                    # We've already found the provider, so hand it over
+                    # rather than have _inherit_provided look it up again.
+                    value = inherit_provided(interface, provider)
+                    if value is not _MISSING:
+                        kwargs[arg_name] = value
+                        continue
+
+                if isinstance(provider, method_type):
+                    lookup_provider = provider.__func__
+                else:
+                    lookup_provider = provider
+                if not dependency_plans.get(lookup_provider):
+                    # Most providers have no dependencies of their own,
+                    # so there's no need to bind them before calling.
+                    if not provide(
+                        provider, provider, arg_name, interface, kwargs,
+                        unprovided,
+                    ):
+                        reusable = False
+                    continue
+
+                bound_provider = bound_funcs.get(provider)
+                if bound_provider is None:
+                    # Bind the provider first so it can request
+                    # dependencies of its own, then resume this frame.
+                    stack.append(
+                        start_binding(
+                            provider, arg_name, interface, visiting,
+                        )
+                    )
+                    break
+
+                if dependency_map.get(bound_provider):
+                    unprovided[arg_name] = interface
+                    continue
+
+                if not provide(
+                    bound_provider, provider, arg_name, interface, kwargs,
+                    unprovided,
+                ):
+                    reusable = False
+            else:
+                stack.pop()
+                visiting.popitem()
+
+                func = frame.func
+                lookup_func = frame.lookup_func
+                injected = finish_binding(
+                    func, lookup_func, kwargs, unprovided,
+                )
+
+                if len(stack) == 0:
+                    if reusable:
+                        self.resolved_deps[lookup_func] = (
+                            kwargs, unprovided,
+                            dependency_plans.get(injected),
+                        )
+                    return injected
+
+                waiting_frame = stack[-1]
+                waiting_arg_name = frame.waiting_arg_name
+                waiting_interface = frame.waiting_interface
+                if len(unprovided) > 0:
+                    waiting_frame.unprovided[waiting_arg_name] = (
+                        waiting_interface
+                    )
+                    continue
+
+                if not provide(
+                    injected, func, waiting_arg_name, waiting_interface,
+                    waiting_frame.kwargs, waiting_frame.unprovided,
+                ):
+                    reusable = False
+
+    def _start_binding(
+        self, func, waiting_arg_name, waiting_interface, visiting,
+    ):
         # If we've been given a bound method then we need to peel off
         # the binding wrapper to find the item in our dependencies table,
         # but we still want to return a wrapper around exactly what was
         # provided, so an injected bound method stays bound.
         if isinstance(func, types.MethodType):
-            lookup_func = func.im_func
+            lookup_func = func.__func__
         else:
             lookup_func = func
 
-        if lookup_func in self.currently_binding:
+        if lookup_func in visiting:
+            cycle = list(visiting)
+            cycle = cycle[cycle.index(lookup_func):]
             raise DependencyCycleError(
                 "Dependency cycle between the following callables: %s" % (
-                    ", ".join(self.currently_binding),
+                    ", ".join(repr(x) for x in cycle),
                 )
             )
 
-        self.currently_binding.add(lookup_func)
-
-        try:
-            deps = self.app.dependency_map[lookup_func]
-        except KeyError:
-            deps = EMPTY_DEPS
+        plan = self.app._dependency_plans.get(lookup_func, EMPTY_PLAN)
+        visiting[lookup_func] = None
 
-        kwargs = {}
-        unprovided = {}
-        for arg_name, interface in deps.iteritems():
-            try:
-                kwargs[arg_name] = self.get(interface)
-            except DependencyError:
-                # Record unprovided interfaces to allow partial injection,
-                # e.g. to allow some interfaces to be injected at application
-                # startup time and then others to be injected on a
-                # per-request basis.
-                unprovided[arg_name] = interface
-                continue
+        return _BindingFrame(
+            func, lookup_func, plan, waiting_arg_name, waiting_interface,
+        )
 
-        self.currently_binding.remove(lookup_func)
+    def _finish_binding(
+        self, func, lookup_func, kwargs, unprovided, unprovided_plan=None,
+    ):
+        # Produce the callable to return from bind, once we know what can
+        # and can't be provided.
+        if len(kwargs) == 0 and (len(unprovided) == 0 or func is lookup_func):
+            # There's nothing to inject, and anything left unprovided is
+            # already registered against func itself, so a wrapper would
+            # only add call overhead. We don't cache this in bound_funcs
+            # because that would keep func alive forever.
+            return func
 
         injected = functools.partial(func, **kwargs)
         if len(unprovided) > 0:
-            self.app.dependencies(
-                injected,
-                **unprovided
-            )
+            self.app._register(injected, unprovided, unprovided_plan)
         self.bound_funcs[func] = injected
         return injected
 
+    def _provide(
+        self, provider, raw_provider, arg_name, interface, kwargs, unprovided,
+    ):
+        # Call a provider whose dependencies have all been bound to produce
+        # the implementation of the given interface, recording the result
+        # in either kwargs or unprovided depending on whether the provider
+        # succeeded. raw_provider is the provider as registered, before
+        # binding. Returns False if the result must not be reused.
+        try:
+            provided = provider(interface)
+        except DependencyError:
+            unprovided[arg_name] = interface
+            return True
+
+        kwargs[arg_name] = provided
+        if getattr(raw_provider, "shared", True):
+            self.provided[interface] = provided
+            return True
+        return False
+
     def call(self, func, *args, **kwargs):
         """
         Call a callable that may have registered dependencies.
@@ -221,19 +472,19 @@ class Injector(object):
         this will raise a :py:class:`DependencyError`.
         """
         bound = self.bind(func)
-        if bound in self.app.dependency_map:
-            if len(self.app.dependency_map[bound]) > 0:
-                raise DependencyError(
-                    "Unresolved dependencies for %r: %s" % (
-                        func,
-                        ", ".join(
-                            (
-                                repr(x) for x in
-                                self.app.dependency_map[bound].iterkeys()
-                            ),
-                        )
-                    ),
-                )
+        unprovided = self.app.dependency_map.get(bound)
+        if unprovided:
+            raise DependencyError(
+                "Unresolved dependencies for %r: %s" % (
+                    func,
+                    ", ".join(
+                        (
+                            repr(x) for x in
+                            unprovided.keys()
+                        ),
+                    )
+                ),
+            )
         return bound(*args, **kwargs)
 
     def specialize(self, *provider_sets, **kwargs):
@@ -253,20 +504,216 @@ class Injector(object):
         :py:meth:`Injector.bind`) to do up-front as much dependency
         provision as possible, but defer a few request-specific dependencies
         until the request is being handled.
+
+        The new injector calls its providers afresh, even those it
+        inherits from this injector, so e.g. a database session provider
+        produces one session per request. A provider function that has an
+        attribute ``singleton`` set to ``True`` is instead called only by
+        the injector it was given to, and every injector derived from that
+        one shares the implementation it returns. This means that
+        application-wide objects are created only once, no matter how
+        many per-request injectors are derived from the application-wide
+        injector. A derived injector that has its own provider for any
+        interface the singleton depends on, directly or indirectly, calls
+        the singleton provider itself instead.
         """
-        # By the time we're in here the original provider sets we were
-        # passed have already be flattened into our providers dict,
-        # so we don't need to worry about flattening them again.
-        new_providers = dict(self.providers)
-        local_providers = kwargs.get("local_providers")
-        if local_providers is not None:
-            new_providers.update(local_providers)
+        # The new injector only keeps hold of its own providers and
+        # consults ours for anything else, so specializing doesn't need
+        # to copy our entire providers dict.
         return Injector(
             self.app,
             provider_sets,
-            new_providers,
+            kwargs.get("local_providers"),
+            parent=self,
         )
 
+    def _inherit_provided(self, interface, provider=_MISSING):
+        # Returns the implementation of the given interface built by the
+        # parent injector whose provider we're using, or _MISSING if the
+        # provider isn't a singleton, or if it's our own, or if we (or an
+        # injector in between) provide differently anything that the
+        # implementation would be built from. Callers that have already
+        # found the provider may pass it in to save looking it up again.
+        if provider is _MISSING:
+            provider = self._find_provider(interface)
+        if not getattr(provider, "singleton", False):
+            return _MISSING
+        if not getattr(provider, "shared", True):
+            # An unshared provider is called anew each time, by whichever
+            # injector needs it.
+            return _MISSING
+
+        # We walk up the chain of parents iteratively rather than
+        # recursively, since specialized injectors can themselves be
+        # specialized to an arbitrary depth.
+        interface_type = type(interface)
+        injectors = []
+        injector = self
+        while True:
+            own_providers = injector._own_providers
+            if own_providers.get(
+                interface, own_providers.get(interface_type),
+            ) is provider:
+                break
+            injectors.append(injector)
+            injector = injector.parent
+        if len(injectors) == 0:
+            return _MISSING
+
+        closure = injector._dependency_closure(interface)
+        for between in injectors:
+            if not closure.isdisjoint(between._own_providers):
+                return _MISSING
+
+        provided = injector.provided.get(interface, _MISSING)
+        if provided is _MISSING:
+            # Build the singleton in the injector it belongs to, so it
+            # makes no difference which injector asks for it first.
+            try:
+                provided = injector.get(interface)
+            except DependencyError:
+                return _MISSING
+
+        # Remember the inherited object all the way down, so we won't
+        # need to walk up this far again.
+        for between in injectors:
+            between.provided[interface] = provided
+        return provided
+
+    def _dependency_closure(self, interface):
+        # Returns a frozenset of all of the interfaces, and their types,
+        # that our provider for the given interface depends on directly
+        # or indirectly. Our providers never change, so we need only
+        # work this out once per interface.
+        closure = self._dependency_closures.get(interface)
+        if closure is not None:
+            return closure
+
+        dependency_plans = self.app._dependency_plans
+        seen = set()
+        pending = [interface]
+        while pending:
+            provider = self._find_provider(pending.pop())
+            if provider is _MISSING:
+                continue
+            if isinstance(provider, types.MethodType):
+                provider = provider.__func__
+            for arg_name, dep, dep_type in dependency_plans.get(
+                provider, EMPTY_PLAN,
+            ):
+                if dep not in seen:
+                    seen.add(dep)
+                    pending.append(dep)
+
+        closure = frozenset(seen).union([type(dep) for dep in seen])
+        self._dependency_closures[interface] = closure
+        return closure
+
+    def _find_provider(self, interface):
+        # Returns the provider for the given interface, or _MISSING if
+        # there is none.
+        provider = self.providers.get(interface, _MISSING)
+        if provider is _MISSING:
+            provider = self.providers.get(type(interface), _MISSING)
+        return provider
+
+
+class _LayeredProviders(collections.abc.Mapping):
+    """
+    Read-only view of a specialized injector's providers.
+
+    Looks first in the providers given to the specialized injector itself,
+    then in those given to each injector it was derived from in turn, and
+    finally in the providers of the original unspecialized injector.
+    """
+    __slots__ = ("layers", "root")
+
+    def __init__(self, providers, parent_providers):
+        # We flatten the chain of parents into a tuple of layers, rather
+        # than wrapping the parent's view, so that lookups don't recurse
+        # once per level of specialization.
+        if isinstance(parent_providers, _LayeredProviders):
+            self.layers = (providers,) + parent_providers.layers
+            self.root = parent_providers.root
+        else:
+            self.layers = (providers,)
+            self.root = parent_providers
+
+    def get(self, key, default=None):
+        for layer in self.layers:
+            provider = layer.get(key, _MISSING)
+            if provider is not _MISSING:
+                return provider
+        return self.root.get(key, default)
+
+    def __getitem__(self, key):
+        for layer in self.layers:
+            provider = layer.get(key, _MISSING)
+            if provider is not _MISSING:
+                return provider
+        return self.root[key]
+
+    def __contains__(self, key):
+        for layer in self.layers:
+            if key in layer:
+                return True
+        return key in self.root
+
+    def __iter__(self):
+        seen = set()
+        for layer in self.layers + (self.root,):
+            for key in layer:
+                if key not in seen:
+                    seen.add(key)
+                    yield key
+
+    def __len__(self):
+        return sum(1 for key in self)
+
+
+class _BindingFrame(object):
+    """
+    One callable that :py:meth:`Injector.bind` is part-way through binding.
+
+    ``kwargs`` and ``unprovided`` collect the dependencies visited so far,
+    and ``waiting_arg_name`` and ``waiting_interface`` say which argument
+    of the frame below this one is waiting for the callable, if it's a
+    provider.
+    """
+    __slots__ = (
+        "func",
+        "lookup_func",
+        "deps_iter",
+        "kwargs",
+        "unprovided",
+        "waiting_arg_name",
+        "waiting_interface",
+    )
+
+    def __init__(
+        self, func, lookup_func, plan, waiting_arg_name, waiting_interface,
+    ):
+        self.func = func
+        self.lookup_func = lookup_func
+        self.deps_iter = iter(plan)
+        self.kwargs = {}
+        self.unprovided = {}
+        self.waiting_arg_name = waiting_arg_name
+        self.waiting_interface = waiting_interface
+
+
+def _compile_plan(mapping):
+    # A binding plan is a tuple of (arg_name, interface, interface_type)
+    # triples. Iterating over a tuple is cheaper than iterating over the
+    # items of a dict, and the plan can be shared by all injectors for the
+    # application. (Separate tuples of names and interfaces would be slower
+    # still, since pairing them back up with zip or indexing costs more
+    # than unpacking each triple.)
+    return tuple(
+        (arg_name, interface, type(interface))
+        for arg_name, interface in mapping.items()
+    )
+
 
 def make_interface(name=None):
     """
@@ -279,7 +726,11 @@ def make_interface(name=None):
     enable the registration of a single provider function that works for
     all instances of the enumeration.
     """
-    if_type = type(name, (object,), {})
+    if name is None:
+        name = "interface"
+    # Interfaces have no state of their own, so there's no need for
+    # instances to carry a dict.
+    if_type = type(name, (object,), {"__slots__": ()})
     return if_type()
 
 
@@ -299,12 +750,22 @@ def make_interface_enum(*names):
     with a separate instance for each given name.
     """
     type_name = "interface_enum(%s)" % (", ".join(names))
-    if_type = type(type_name, (object,), {
-        "__repr__": lambda self: "<%s.%s>" % (type_name, self.name),
-    })
+    attrs = {
+        "__repr__": lambda self: self._repr,
+    }
+    # Each instance only needs to carry its name and its repr string, so
+    # we can store these in slots rather than giving every instance its
+    # own dict. We can't do this if one of the interfaces has the same
+    # name as a slot, because then the interface instance would shadow
+    # the slot.
+    slots = ("name", "_repr")
+    if not any(slot in names for slot in slots):
+        attrs["__slots__"] = slots
+    if_type = type(type_name, (object,), attrs)
     for name in names:
         if_inst = if_type()
         if_inst.name = name
+        if_inst._repr = "<%s.%s>" % (type_name, name)
         setattr(if_type, name, if_inst)
     return if_type
 
@@ -321,20 +782,19 @@ class ProviderSetMeta(type):
                 providers.update(base_type_providers)
 
         # Now add all of the providers on *this* type
-        for member in dict.itervalues():
-            if callable(member):
-                # If this attribute is present then we know the method
-                # was decorated with @ProviderSet.provide.
-                if hasattr(member, "provider_interfaces"):
-                    providers.add(member)
+        for member in dict.values():
+            # If this attribute is present then we know the method
+            # was decorated with @ProviderSet.provide, and so it must
+            # be callable.
+            if getattr(member, "provider_interfaces", None) is not None:
+                providers.add(member)
 
-        dict["providers"] = providers
+        dict["providers"] = frozenset(providers)
 
         return type.__new__(self, name, bases, dict)
 
 
-class ProviderSet(object):
-    __metaclass__ = ProviderSetMeta
+class ProviderSet(object, metaclass=ProviderSetMeta):
 
     def __init__(self):
         if type(self) is ProviderSet:
@@ -345,7 +805,7 @@ class ProviderSet(object):
     @staticmethod
     def provide(*interfaces, **dependencies):
         def annotate(func):
-            func.provider_interfaces = set(interfaces)
+            func.provider_interfaces = interfaces
             func.provider_dependencies = dependencies
             return func
         return annotate